@@ -1,47 +1,74 @@
 import argparse
+import re
 import time
+from collections import namedtuple
+from urllib.parse import urljoin
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+CARD_SEL = "div.item-card"
+NAME_SEL = "a.item-card__name"
+PRICE_SEL = "span.item-card__prices-price"
+PROPS_SEL = "span.item-card__properties-value"
+PRICE_RE = re.compile(r"\d(?:[ \xa0\u2009\u202f]?\d)*")
+
+Entry = namedtuple("Entry", "title price url ram")
+
+CARDS_HTML_JS = (
+    "return Array.from(document.querySelectorAll(arguments[0]))"
+    ".map(c => c.outerHTML).join('');"
+)
 
 def scroll_down(driver):
-    """Автоскролл страницы до конца для подгрузки элементов."""
+    """Автоскролл страницы до конца: ждёт роста высоты, но не дольше 1.2 с на шаг."""
     last_height = driver.execute_script("return document.body.scrollHeight")
     while True:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1.2)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
+        try:
+            WebDriverWait(driver, 1.2, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.body.scrollHeight") > last_height
+            )
+        except TimeoutException:
             break
-        last_height = new_height
-
-def extract_details(card):
-    """Извлекает название, цену, ссылку и RAM."""
-    try:
-        title_element = card.find_element(By.CSS_SELECTOR, "a.item-card__name")
-        title = title_element.text.strip()
-        url = title_element.get_attribute("href")
-    except:
-        title, url = "Название: не указано", "Ссылка: не указана"
-
-    try:
-        price = card.find_element(By.CSS_SELECTOR, "span.item-card__prices-price").text.strip()
-    except:
-        price = "Цена: не указана"
+        last_height = driver.execute_script("return document.body.scrollHeight")
+
+def node_text(node):
+    """Текст узла одной строкой: текстовые узлы через пробел, пробелы и переносы схлопнуты."""
+    return " ".join(node.text(separator=" ").split())
+
+def extract_details(card, base_url):
+    """Извлекает название, цену (целым числом или None), ссылку и RAM."""
+    title, url = "Название: не указано", "Ссылка: не указана"
+    title_element = card.css_first(NAME_SEL)
+    if title_element is not None:
+        title = node_text(title_element)
+        href = title_element.attributes.get("href")
+        if href:
+            try:
+                url = urljoin(base_url, href)
+            except ValueError:
+                pass
+
+    price = None
+    price_element = card.css_first(PRICE_SEL)
+    if price_element is not None:
+        match = PRICE_RE.search(price_element.text())
+        if match:
+            price = int("".join(match.group().split()))
 
     ram = "Характеристики: не указано"
-    try:
-        props = card.find_elements(By.CSS_SELECTOR, "span.item-card__properties-value")
-        for p in props:
-            if "Гб" in p.text or "GB" in p.text:
-                ram = p.text.strip()
-    except:
-        pass
+    for p in card.css(PROPS_SEL):
+        text = node_text(p)
+        if "Гб" in text or "GB" in text:
+            ram = text
 
-    return title, price, url, ram
+    return Entry(title, price, url, ram)
 
 def parse_all_pages(start_url, headless):
     options = Options()
@@ -49,6 +76,7 @@ def parse_all_pages(start_url, headless):
         options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
+    options.add_argument("--blink-settings=imagesEnabled=false")
 
     driver = webdriver.Chrome(options=options)
     driver.get(start_url)
@@ -61,11 +89,13 @@ def parse_all_pages(start_url, headless):
         scroll_down(driver)
         time.sleep(1)
 
-        cards = driver.find_elements(By.CSS_SELECTOR, "div.item-card")
+        tree = LexborHTMLParser(driver.execute_script(CARDS_HTML_JS, CARD_SEL))
+        cards = tree.css(CARD_SEL)
         print(f"  Найдено карточек: {len(cards)}")
 
+        base_url = driver.current_url
         for card in cards:
-            data = extract_details(card)
+            data = extract_details(card, base_url)
             all_results.append(data)
 
         try:
@@ -84,9 +114,11 @@ def parse_all_pages(start_url, headless):
     return all_results
 
 def save_results(items, filename="kaspi_output.txt"):
-    with open(filename, "w", encoding="utf-8") as file:
-        for title, price, url, ram in items:
-            file.write(f"{title} | {price} | {url} | {ram}\n")
+    with open(filename, "w", encoding="utf-8", buffering=1 << 20) as file:
+        file.writelines(
+            f"{title} | {'Цена: не указана' if price is None else price} | {url} | {ram}\n"
+            for title, price, url, ram in items
+        )
     print(f"\nГотово. Сохранено: {len(items)} товаров. Файл: {filename}")
 
 if __name__ == "__main__":